@@ -14,11 +14,16 @@ file formats.
 '''
 
 import collections
+import concurrent.futures
 import glob
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
 import sysconfig
@@ -77,8 +82,30 @@ def run_make(targets):
     subprocess.check_call([os.environ.get("MAKE", "make")] + targets)
 
 
-def run_make_print_config():
-    stdout = subprocess.check_output([os.environ.get("MAKE", "make"), "-s", "print-config"], encoding="ascii")
+def build_jobs():
+    return int(os.environ.get("PYSAM_BUILD_JOBS", os.cpu_count() or 1))
+
+
+def run_make_print_config(cache_file=".pysam_makeconfig_cache.json"):
+    # The configure script rewrites config.mk on every run, so the cached
+    # output is keyed on the makefiles' contents rather than their mtimes.
+    make = os.environ.get("MAKE", "make")
+    key = hashlib.sha1(make.encode())
+    for fn in ["Makefile", "config.mk", "htscodecs.mk"]:
+        if os.path.exists(fn):
+            with open(fn, "rb") as inf:
+                key.update(inf.read())
+    key = key.hexdigest()
+
+    try:
+        with open(cache_file) as inf:
+            cache = json.load(inf)
+        if cache["key"] == key:
+            return cache["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    stdout = subprocess.check_output([make, "-s", "print-config"], encoding="ascii")
 
     make_print_config = {}
     for line in stdout.splitlines():
@@ -87,22 +114,41 @@ def run_make_print_config():
             if len(row) == 2:
                 make_print_config.update(
                     {row[0].strip(): row[1].strip()})
+
+    try:
+        with open(cache_file, "w") as outf:
+            json.dump({"key": key, "config": make_print_config}, outf)
+    except OSError:
+        pass
+
     return make_print_config
 
 
+NM_SKIP_TYPES = frozenset([b"U", b"F", b"N", b"W", b"w"])
+NM_SKIP_FIRST = frozenset("_$.@")
+
+
 def run_nm_defined_symbols(objfile):
-    stdout = subprocess.check_output(["nm", "-g", "-P", objfile], encoding="ascii")
+    args = ["nm", "-g", "-P", objfile]
 
+    # Parse the output as nm produces it, rather than buffering all of it
     symbols = set()
-    for line in stdout.splitlines():
-        (sym, symtype) = line.split()[:2]
-        if symtype not in "UFNWw":
-            if IS_DARWIN:
-                # On macOS, all symbols have a leading underscore
-                symbols.add(sym[1:] if sym.startswith("_") else sym)
-            else:
-                # Ignore symbols such as _edata (present in all shared objects)
-                if sym[0] not in "_$.@": symbols.add(sym)
+    with subprocess.Popen(args, stdout=subprocess.PIPE) as proc:
+        for line in proc.stdout:
+            fields = line.split(None, 2)
+            if len(fields) < 2: continue
+            (sym, symtype) = fields[:2]
+            if symtype not in NM_SKIP_TYPES:
+                sym = sym.decode("ascii")
+                if IS_DARWIN:
+                    # On macOS, all symbols have a leading underscore
+                    symbols.add(sym[1:] if sym.startswith("_") else sym)
+                else:
+                    # Ignore symbols such as _edata (present in all shared objects)
+                    if sym[:1] not in NM_SKIP_FIRST: symbols.add(sym)
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args)
 
     # Work around Cython 3.1.2 bug whereby this function is not static
     symbols.discard("__pyx_CommonTypesMetaclass_get_module")
@@ -110,6 +156,19 @@ def run_nm_defined_symbols(objfile):
     return symbols
 
 
+def ccache_prefix(cc):
+    """Returns the command prefix needed to run the compiler via ccache, which is
+    used when it is available unless PYSAM_NO_CCACHE=1 is set."""
+    if os.environ.get("PYSAM_NO_CCACHE") == "1" or not shutil.which("ccache"):
+        return []
+    if not cc or os.path.basename(cc.split()[0]) == "ccache":
+        return []
+
+    # Generated headers are often rewritten with unchanged contents
+    os.environ.setdefault("CCACHE_SLOPPINESS", "time_macros,include_file_mtime")
+    return ["ccache"]
+
+
 # This function emulates the way distutils combines settings from sysconfig,
 # environment variables, and the extension being built. It returns a dictionary
 # representing the usual set of variables, suitable for writing to a generated
@@ -169,15 +228,22 @@ def write_configvars_header(filename, ext, prefix):
 @contextmanager
 def set_compiler_envvars():
     tmp_vars = []
+    saved_vars = {}
+    config_vars = sysconfig.get_config_vars()
     for var in ['CC', 'CFLAGS', 'LDFLAGS']:
         if var in os.environ:
-            if var == 'CFLAGS' and 'CCSHARED' in sysconfig.get_config_vars():
-                os.environ[var] += ' ' + sysconfig.get_config_var('CCSHARED')
+            if var == 'CFLAGS' and 'CCSHARED' in config_vars:
+                os.environ[var] += ' ' + config_vars['CCSHARED']
+            if var == 'CC':
+                saved_vars[var] = os.environ[var]
+                os.environ[var] = " ".join(ccache_prefix(os.environ[var]) + [os.environ[var]])
             print(f"# pysam: (env) {var}={os.environ[var]}")
-        elif var in sysconfig.get_config_vars():
-            value = sysconfig.get_config_var(var)
-            if var == 'CFLAGS' and 'CCSHARED' in sysconfig.get_config_vars():
-                value += ' ' + sysconfig.get_config_var('CCSHARED')
+        elif var in config_vars:
+            value = config_vars[var]
+            if var == 'CFLAGS' and 'CCSHARED' in config_vars:
+                value += ' ' + config_vars['CCSHARED']
+            if var == 'CC':
+                value = " ".join(ccache_prefix(value) + [value])
             print(f"# pysam: (sysconfig) {var}={value}")
             os.environ[var] = value
             tmp_vars += [var]
@@ -187,6 +253,7 @@ def set_compiler_envvars():
     finally:
         for var in tmp_vars:
             del os.environ[var]
+        os.environ.update(saved_vars)
 
 
 def format_macro_option(name, value):
@@ -233,7 +300,14 @@ class cythonize_sdist(sdist):
 
     def run(self):
         from Cython.Build import cythonize
-        cythonize(self.distribution.ext_modules)
+        # cythonize() uses a multiprocessing pool, whose workers would re-run
+        # this unguarded setup.py under the spawn and forkserver start methods
+        if multiprocessing.get_start_method() == "fork":
+            nthreads = int(os.environ.get("PYSAM_CYTHON_JOBS", os.cpu_count() or 1))
+        else:
+            nthreads = 0
+        cythonize(self.distribution.ext_modules, nthreads=nthreads,
+                  compiler_directives=cython_directives)
         super().run()
 
 
@@ -243,6 +317,8 @@ class CyExtension(Extension):
     def __init__(self, *args, **kwargs):
         self._init_func = kwargs.pop("init_func", None)
         self._prebuild_func = kwargs.pop("prebuild_func", None)
+        # Used by Cython's build_ext when cythonizing this extension
+        self.cython_directives = kwargs.pop("cython_directives", {})
         super().__init__(*args, **kwargs)
 
     def extend_includes(self, includes):
@@ -262,9 +338,35 @@ class cy_build_ext(build_ext):
         Avoid by adding an appropriate #define to import/pysam.h or in
         unusual cases adding another rewrite rule to devtools/import.py.
         """
+        # Symbols are cached by file modification time, so that rebuilds
+        # need only rescan the extensions that have actually changed.
+        cache_file = os.path.join(self.build_temp, "nm_cache.json")
+        try:
+            with open(cache_file) as inf:
+                cache = json.load(inf)
+        except (OSError, ValueError):
+            cache = {}
+
+        def defined_symbols(path):
+            mtime = os.path.getmtime(path)
+            entry = cache.get(path)
+            if entry is None or entry["mtime"] != mtime:
+                entry = {"mtime": mtime, "symbols": sorted(run_nm_defined_symbols(path))}
+                cache[path] = entry
+            return entry["symbols"]
+
+        exts = self.distribution.ext_modules
+        paths = [self.get_ext_fullpath(ext.name) for ext in exts]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 4)) as pool:
+            results = list(pool.map(defined_symbols, paths))
+
+        os.makedirs(self.build_temp, exist_ok=True)
+        with open(cache_file, "w") as outf:
+            json.dump(cache, outf)
+
         symbols = dict()
-        for ext in self.distribution.ext_modules:
-            for sym in run_nm_defined_symbols(self.get_ext_fullpath(ext.name)):
+        for ext, ext_symbols in zip(exts, results):
+            for sym in ext_symbols:
                 symbols.setdefault(sym, []).append(ext.name.lstrip('pysam.'))
 
         errors = 0
@@ -275,21 +377,135 @@ class cy_build_ext(build_ext):
 
         if errors > 0: raise LinkError("symbols defined in multiple extensions")
 
+    def compiler_name(self):
+        """Returns the compiler's name for messages, skipping any ccache wrapper."""
+        compiler = getattr(self.compiler, "compiler", "C compiler")
+        if isinstance(compiler, list):
+            compiler = next((word for word in compiler if os.path.basename(word) != "ccache"), "C compiler")
+        return compiler
+
+    def cached_probe(self, key, probe):
+        """Returns the result of probe(), which is cached in build_temp until the
+        compiler command or executable changes. Failures (None) are not cached."""
+        compiler = getattr(self.compiler, "compiler", "C compiler")
+        command = " ".join(compiler) if isinstance(compiler, list) else compiler
+        executable = next((shutil.which(word) for word in command.split()
+                           if os.path.basename(word) != "ccache"), None)
+
+        cache_file = os.path.join(self.build_temp, "compiler_probes.json")
+        try:
+            with open(cache_file) as inf:
+                cache = json.load(inf)
+            if not executable or os.path.getmtime(cache_file) <= os.path.getmtime(executable):
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("compiler") == command:
+            log.info("(using cached compiler probe result)")
+            return entry["result"]
+
+        result = probe()
+        if result is not None:
+            cache[key] = {"compiler": command, "result": result}
+            os.makedirs(self.build_temp, exist_ok=True)
+            with open(cache_file, "w") as outf:
+                json.dump(cache, outf)
+        return result
+
     def c99_compile_args(self):
         """Determines whether any compiler flags are needed to ensure C99 compilation."""
-        compiler = getattr(self.compiler, "compiler", "C compiler")
-        if isinstance(compiler, list): compiler = compiler[0]
-        log.info("checking for %s option to enable C99 features...", compiler)
-        for flags in [None, ["-std=c99"], ["-std=gnu99"]]:
+        compiler = self.compiler_name()
+
+        def probe():
+            log.info("checking for %s option to enable C99 features...", compiler)
+            for flags in [[], ["-std=c99"], ["-std=gnu99"]]:
+                try:
+                    self.compiler.compile(["pysam/conftest_cstd.c"], output_dir=self.build_temp, extra_preargs=flags or None)
+                    return flags
+                except CompileError:
+                    log.info("(ignoring errors from test probes)")
+            return None
+
+        flags = self.cached_probe("c99", probe)
+        if flags is None:
+            log.error("%s cannot compile C99 source code", compiler)
+            return None
+
+        log.info("%s option to enable C99 features: %s", compiler, " ".join(flags) if flags else "none needed")
+        return flags
+
+    def supported_compile_args(self, candidates):
+        """Determines which of the candidate compiler flags are accepted."""
+        if not candidates: return []
+        compiler = self.compiler_name()
+
+        def probe():
+            supported = []
+            for flag in candidates:
+                try:
+                    self.compiler.compile(["pysam/conftest_cstd.c"], output_dir=self.build_temp, extra_preargs=[flag])
+                    supported.append(flag)
+                except CompileError:
+                    log.info("(ignoring errors from test probes)")
+            return supported
+
+        supported = self.cached_probe("optimise " + " ".join(candidates), probe)
+        log.info("%s supports optimisation options: %s", compiler, " ".join(supported) if supported else "none")
+        return supported
+
+    def lto_args(self):
+        """Determines whether link-time optimisation can be used."""
+        if os.environ.get("PYSAM_NO_LTO") == "1" or self.compiler.compiler_type != "unix": return []
+        candidates = ["-flto=auto"]
+
+        def probe():
             try:
-                self.compiler.compile(["pysam/conftest_cstd.c"], output_dir=self.build_temp, extra_preargs=flags)
-                log.info("%s option to enable C99 features: %s", compiler, " ".join(flags) if flags else "none needed")
-                return flags
-            except CompileError:
+                objects = self.compiler.compile(["pysam/conftest_cstd.c"], output_dir=self.build_temp, extra_preargs=candidates)
+                self.compiler.link_shared_object(objects, "conftest_lto.so", output_dir=self.build_temp, extra_postargs=candidates)
+                return candidates
+            except (CompileError, LinkError):
                 log.info("(ignoring errors from test probes)")
+                return []
 
-        log.error("%s cannot compile C99 source code", compiler)
-        return None
+        linker = getattr(self.compiler, "linker_so", None) or []
+        flags = self.cached_probe("lto " + " ".join(candidates + linker), probe)
+        if flags:
+            log.info("using link-time optimisation: %s", " ".join(flags))
+        else:
+            log.info("not using link-time optimisation")
+        return flags
+
+    def enable_parallel_compile(self, jobs):
+        """Compiles each extension's source files concurrently.
+        Extensions themselves are still built one at a time and in order,
+        as later modules link against the earlier ones.
+        """
+        compiler = self.compiler
+        if jobs <= 1 or compiler.compiler_type != "unix": return
+
+        # This relies on CCompiler internals, so keep the stock method if they change
+        if not all(hasattr(compiler, attr) for attr in ["_setup_compile", "_get_cc_args", "_compile"]):
+            log.warning("compiling extension sources serially (compiler internals not available)")
+            return
+
+        def parallel_compile(sources, output_dir=None, macros=None, include_dirs=None, debug=0,
+                             extra_preargs=None, extra_postargs=None, depends=None):
+            macros, objects, extra_postargs, pp_opts, build = compiler._setup_compile(
+                output_dir, macros, include_dirs, sources, depends, extra_postargs)
+            cc_args = compiler._get_cc_args(pp_opts, debug, extra_preargs)
+
+            def compile_one(obj):
+                src, ext = build[obj]
+                compiler._compile(obj, src, ext, cc_args, extra_postargs, pp_opts)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+                list(pool.map(compile_one, [obj for obj in objects if obj in build]))
+            return objects
+
+        log.info("compiling extension sources with %d parallel jobs", jobs)
+        compiler.compile = parallel_compile
 
     def run(self):
         if sys.platform == 'darwin':
@@ -305,7 +521,22 @@ class cy_build_ext(build_ext):
         except subprocess.CalledProcessError:
             log.warning("skipping symbol collision check (invoking nm failed)")
 
+    def enable_ccache(self):
+        """Runs the compiler via ccache, if available."""
+        executables = {}
+        for executable in ["compiler", "compiler_so"]:
+            command = getattr(self.compiler, executable, None)
+            if isinstance(command, list) and command:
+                prefix = ccache_prefix(command[0])
+                if prefix: executables[executable] = prefix + command
+
+        if executables:
+            log.info("using ccache to compile extensions")
+            self.compiler.set_executables(**executables)
+
     def build_extensions(self):
+        self.enable_ccache()
+
         c99_flags = self.c99_compile_args()
         if c99_flags:
             executables = {}
@@ -316,6 +547,24 @@ class cy_build_ext(build_ext):
                     elif isinstance(command, str): executables[executable] = f"{command} {' '.join(c99_flags)}"
             self.compiler.set_executables(**executables)
 
+        optimise_flags = self.supported_compile_args(optimise_compile_args)
+
+        # Objects compiled for LTO are not usable from the libhts.a archive
+        # that separate mode links into each extension.
+        lto_flags = self.lto_args() if HTSLIB_MODE != 'separate' else []
+
+        for ext in self.extensions:
+            ext.extra_compile_args = ext.extra_compile_args + optimise_flags + lto_flags
+            ext.extra_link_args = (ext.extra_link_args or []) + lto_flags
+
+        # Build the extensions serially, as they depend on each other, but
+        # use the requested number of jobs to compile their sources.
+        # As in setuptools, a job count of 0 means a serial build
+        if self.parallel is None or self.parallel is True: self.jobs = max(1, build_jobs())
+        else: self.jobs = max(1, int(self.parallel))
+        self.parallel = None
+        self.enable_parallel_compile(self.jobs)
+
         super().build_extensions()
 
     def build_extension(self, ext):
@@ -351,7 +600,7 @@ class cy_build_ext(build_ext):
             ext.extra_link_args += ['-Wl,-rpath,$ORIGIN']
 
         if isinstance(ext, CyExtension) and ext._prebuild_func:
-            ext._prebuild_func(ext, self.force)
+            ext._prebuild_func(ext, self.force, self.jobs)
 
         super().build_extension(ext)
 
@@ -366,28 +615,49 @@ class clean_ext(Command):
     def finalize_options(self):
         pass
 
+    @staticmethod
+    def scan_files(path, match):
+        """Lists the files in directory path whose names satisfy match."""
+        try:
+            with os.scandir(path) as entries:
+                return [e.path for e in entries if e.is_file() and match(e.name)]
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def remove_files(paths):
+        """Removes the files concurrently, ignoring any already removed."""
+        def remove(path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(remove, paths))
+
     def run(self):
-        objs = glob.glob(os.path.join("pysam", "libc*.c"))
+        scan_files = self.scan_files
+
+        objs = scan_files("pysam", lambda name: name.startswith("libc") and name.endswith(".c"))
         if objs:
             log.info("removing 'pysam/libc*.c' (%s Cython objects)", len(objs))
-        for obj in objs:
-            os.remove(obj)
 
-        headers = (glob.glob(os.path.join("htslib",   "*config*.h")) +
-                   glob.glob(os.path.join("samtools", "*config*.h")) +
-                   glob.glob(os.path.join("bcftools", "*config*.h")))
+        def is_config_header(name): return "config" in name and name.endswith(".h")
+        headers = (scan_files("htslib",   is_config_header) +
+                   scan_files("samtools", is_config_header) +
+                   scan_files("bcftools", is_config_header))
         if headers:
             log.info("removing '*/*config*.h' (%s generated headers)", len(headers))
-        for header in headers:
-            os.remove(header)
 
-        objects = (glob.glob(os.path.join("htslib", "*.[oa]")) +
-                   glob.glob(os.path.join("htslib", "cram", "*.o")) +
-                   glob.glob(os.path.join("htslib", "htscodecs", "htscodecs", "*.o")))
+        def is_object(name): return name.endswith(".o")
+        objects = (scan_files("htslib", lambda name: name.endswith((".o", ".a"))) +
+                   scan_files(os.path.join("htslib", "cram"), is_object) +
+                   scan_files(os.path.join("htslib", "htscodecs", "htscodecs"), is_object))
         if objects:
             log.info("removing 'htslib/**/*.o' and libhts.a (%s objects)", len(objects))
-        for obj in objects:
-            os.remove(obj)
+
+        self.remove_files(objs + headers + objects)
 
 
 # How to link against HTSLIB
@@ -406,6 +676,12 @@ HTSLIB_INCLUDE_DIR = os.environ.get("HTSLIB_INCLUDE_DIR", None)
 HTSLIB_CONFIGURE_OPTIONS = os.environ.get("HTSLIB_CONFIGURE_OPTIONS", None)
 HTSLIB_SOURCE = None
 
+# Cython compiler directives for all modules, whether cythonized during
+# build_ext or pre-generated for the sdist. Bounds checking and negative
+# index wraparound are left enabled globally, as several modules rely on
+# them; loops that do their own bounds checking disable them locally.
+cython_directives = {"language_level": "3"}
+
 package_list = ['pysam',
                 'pysam.include',
                 'pysam.include.samtools',
@@ -446,11 +722,24 @@ if HTSLIB_MODE in ['shared', 'separate']:
                      'pysam.include.htslib.htslib']
     package_dirs.update({'pysam.include.htslib':'htslib'})
 
-    htslib_configure_options = configure_library(
-        "htslib",
-        HTSLIB_CONFIGURE_OPTIONS,
-        ["--enable-libcurl",
-         "--disable-libcurl"])
+    configure_fallbacks = ["--enable-libcurl",
+                           "--disable-libcurl"]
+
+    if os.environ.get("CIBUILDWHEEL", "0") == "1":
+        # Wheels should link libdeflate (see devtools/install-prerequisites.sh),
+        # but it is not installable on every build image
+        htslib_configure_options = configure_library(
+            "htslib",
+            HTSLIB_CONFIGURE_OPTIONS,
+            [f"{option} --with-libdeflate" for option in configure_fallbacks])
+        if htslib_configure_options is None:
+            print("# pysam: WARNING: libdeflate could not be configured - building wheel without it")
+            htslib_configure_options = configure_library("htslib", None, configure_fallbacks)
+    else:
+        htslib_configure_options = configure_library(
+            "htslib",
+            HTSLIB_CONFIGURE_OPTIONS,
+            configure_fallbacks)
 
     HTSLIB_SOURCE = "builtin"
     print(f"# pysam: htslib configure options: {htslib_configure_options}")
@@ -464,6 +753,11 @@ if HTSLIB_MODE in ['shared', 'separate']:
             outf.write(
                 "/* conservative compilation options */\n")
 
+    # LIBHTS_OBJS cannot simply be read from htslib/Makefile: it is built from
+    # $(HTSCODECS_OBJS) (a substitution reference in htscodecs.mk) and
+    # $(NONCONFIGURE_OBJS) (overridden by config.mk), and LIBS comes from
+    # config.mk. So ask make, which run_make_print_config() does only when
+    # these makefiles have changed since its output was last cached.
     with changedir("htslib"):
         htslib_make_options = run_make_print_config()
 
@@ -514,11 +808,7 @@ with open(os.path.join("pysam", "config.py"), "w") as outf:
 
     if HTSLIB_SOURCE == "builtin":
         with open(os.path.join("htslib", "config.h")) as inf:
-            for line in inf:
-                if line.startswith("#define"):
-                    key, value = re.match(
-                        r"#define (\S+)\s+(\S+)", line).groups()
-                    config_values[key] = value
+            config_values.update(re.findall(r"^#define[ \t]+(\S+)[ \t]+(\S+)", inf.read(), re.M))
             for key in ["ENABLE_GCS",
                         "ENABLE_PLUGINS",
                         "ENABLE_S3",
@@ -532,6 +822,10 @@ with open(os.path.join("pysam", "config.py"), "w") as outf:
                 outf.write(f"{key} = {config_values[key]}\n")
                 print(f"# pysam: config_option: {key}={config_values[key]}")
 
+            # htslib's configure uses libdeflate whenever it is available
+            if not config_values["HAVE_LIBDEFLATE"]:
+                print("# pysam: libdeflate not found - install it for faster BGZF compression and CRC32 computation")
+
 # create empty config.h files if they have not been created automatically
 # or created by the user:
 for fn in config_headers:
@@ -548,6 +842,7 @@ if platform.system() == 'Windows':
     include_os = ['win32']
     os_c_files = ['win32/getopt.c']
     extra_compile_args = []
+    optimise_compile_args = []
 else:
     include_os = []
     os_c_files = []
@@ -561,6 +856,17 @@ else:
         "-Wno-sign-compare",
         "-Wno-error=declaration-after-statement"]
 
+    # Optimisation options, each used only if the compiler accepts it.
+    # Symbol visibility is left alone, as the extension modules link
+    # against symbols defined in libchtslib and libcsamtools.
+    optimise_compile_args = [
+        "-O3",
+        "-funroll-loops",
+        "-fno-plt",
+        "-fno-semantic-interposition"]
+    if os.environ.get("PYSAM_NATIVE") == "1":
+        optimise_compile_args += ["-march=native", "-mtune=native"]
+
 define_macros = []
 
 if os.environ.get("CIBUILDWHEEL", "0") == "1":
@@ -592,7 +898,7 @@ libraries_for_pysam_module = external_htslib_libraries + internal_htslib_librari
 # The list below uses the union of include_dirs and library_dirs for
 # reasons of simplicity.
 
-def prebuild_libchtslib(ext, force):
+def prebuild_libchtslib(ext, force, jobs):
     if HTSLIB_MODE not in ['shared', 'separate']: return
 
     write_configvars_header("htslib/config_vars.h", ext, "HTS")
@@ -604,12 +910,12 @@ def prebuild_libchtslib(ext, force):
             # extra flags for configure instead of hacking on ALL_CPPFLAGS.
             args = " ".join(ext.extra_compile_args)
             defines = " ".join([format_macro_option(*pair) for pair in ext.define_macros])
-            run_make(["ALL_CPPFLAGS=-I. " + args + " " + defines + " $(CPPFLAGS)", "lib-static"])
+            run_make([f"-j{jobs}", "ALL_CPPFLAGS=-I. " + args + " " + defines + " $(CPPFLAGS)", "lib-static"])
     else:
         log.warning("skipping 'libhts.a' (already built)")
 
 
-def prebuild_libcsamtools(ext, force):
+def prebuild_libcsamtools(ext, force, jobs):
     write_configvars_header("samtools/samtools_config_vars.h", ext, "SAMTOOLS")
 
 
@@ -671,14 +977,19 @@ modules = [
          libraries=libraries_for_pysam_module),
 ]
 
+# for out-of-tree compilation, use absolute paths
+common_library_dirs = ["pysam"] + htslib_library_dirs
+common_include_dirs = ["pysam"] + htslib_include_dirs + \
+    ["samtools", "samtools/lz4", "bcftools", "."] + include_os
+abspaths = {x: os.path.abspath(x) for x in set(common_library_dirs + common_include_dirs)}
+
 common_options = dict(
     language="c",
     extra_compile_args=extra_compile_args,
     define_macros=define_macros,
-    # for out-of-tree compilation, use absolute paths
-    library_dirs=[os.path.abspath(x) for x in ["pysam"] + htslib_library_dirs],
-    include_dirs=[os.path.abspath(x) for x in ["pysam"] + htslib_include_dirs + \
-                  ["samtools", "samtools/lz4", "bcftools", "."] + include_os])
+    cython_directives=cython_directives,
+    library_dirs=[abspaths[x] for x in common_library_dirs],
+    include_dirs=[abspaths[x] for x in common_include_dirs])
 
 # add common options (in python >3.5, could use n = {**a, **b}
 for module in modules: